@@ -6,6 +6,30 @@
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# Observation count above which _getWSS hands off to the numba kernel (if installed)
+_NUMBA_WSS_THRESHOLD = 100000
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True)
+    def _wss_numba(data, centroids, memberships):
+        """Streaming WSS kernel: accumulates squared errors row by row without
+        materializing the NxD difference array, parallelized over observations."""
+        acc = 0.0
+        for i in prange(data.shape[0]):
+            c = memberships[i]
+            s = 0.0
+            for d in range(data.shape[1]):
+                diff = data[i, d] - centroids[c, d]
+                s += diff * diff
+            acc += s
+        return acc
+
 class ClusterMetric(object):
     """
     A Object to calculate various cluster metrics using the attributes of a KMeans Instance.
@@ -25,9 +49,8 @@ class ClusterMetric(object):
         1. "fit" -> Fits current data to our instance and calculates WSS, BSS, TSS Attributes
     
     Internal Methods:
-        1. "squareVector" -> Calculates the Sum of Squared Error for a observation vector
-        2. "getWSS" -> Calculates the WSS metric for our fitted data
-        3. "getTSS" -> Calculates the TSS metric for our fitted data
+        1. "getWSS" -> Calculates the WSS metric for our fitted data
+        2. "getBSS" -> Calculates the BSS metric for our fitted data
     """
     def __init__(self):
         """
@@ -47,33 +70,35 @@ class ClusterMetric(object):
         self.BSS = None
         self.TSS = None
       
-    def _squareVector(self, vector):
-        """Calculates the squared sum of the vector provided"""
-        return np.matmul(vector, vector.T)
-    
     def _getWSS(self):
         """
-        Performing WSS Calculation by applying squareVector due to likely memory constraints.
-        
+        Performing WSS Calculation as a single fused square-and-reduce pass over the error matrix.
+
         Returns:
             Within Sum of Squares (WSS) Metric
         """
-        within_error = self.obs_data - self.centroids[self.memberships]
-        self.WSS = sum(np.apply_along_axis(self._squareVector, axis=1, arr = within_error))
-        
+        if _NUMBA_AVAILABLE and self.obs_data.shape[0] > _NUMBA_WSS_THRESHOLD:
+            self.WSS = _wss_numba(self.obs_data, self.centroids, self.memberships)
+        else:
+            within_error = self.obs_data - self.centroids[self.memberships]
+            self.WSS = np.einsum('ij,ij->', within_error, within_error)
+
         return self.WSS
-    
-    def _getTSS(self):
+
+    def _getBSS(self):
         """
-        Performing TSS Calculation for all centroids
+        Performing BSS Calculation directly from the centroids using the closed form
+        BSS = sum_k n_k * ||centroid_k - global_mean||^2, which only touches K rows
+        instead of a full pass over the N observations.
 
         Returns:
-            Total Sum of Squares (TSS) Metric
+            Between Sum of Squares (BSS) Metric
         """
-        total_error = self.obs_data - np.tile(self.obs_data.mean(axis=0), (self.obs_data.shape[0],1))
-        self.TSS = sum(np.apply_along_axis(self._squareVector, axis=1, arr = total_error))
-        
-        return self.TSS
+        counts = np.bincount(self.memberships, minlength=len(self.centroids))
+        diff = self.centroids - self.obs_data.mean(axis=0, keepdims=True)
+        self.BSS = np.einsum('k,kd,kd->', counts, diff, diff)
+
+        return self.BSS
     
     def fit(self, cl_centroids, cl_memberships, cl_data):
         """
@@ -84,10 +109,12 @@ class ClusterMetric(object):
             cl_memberships = cluster membership list for all observations in the data
             cl_data = the data used to cluster on
         """
-        self.centroids = np.array(cl_centroids)
-        self.memberships = np.array(cl_memberships)
-        self.obs_data = np.array(cl_data)
+        #Contiguous float64 keeps the einsum/numba paths on aligned SIMD loads,
+        #even when the caller hands over sliced (non-contiguous) pandas data
+        self.centroids = np.ascontiguousarray(cl_centroids, dtype=np.float64)
+        self.memberships = np.asarray(cl_memberships, dtype=np.intp) #intp keeps fancy indexing fast
+        self.obs_data = np.ascontiguousarray(cl_data, dtype=np.float64)
         
         WSS = self._getWSS()
-        TSS = self._getTSS()
-        self.BSS = TSS - WSS
\ No newline at end of file
+        BSS = self._getBSS()
+        self.TSS = WSS + BSS
\ No newline at end of file
@@ -1,57 +1,109 @@
-"""
-@title: backwards selection of OLS using P-Value as the selection criteria
-
-@author: Bejan Lee Sadeghian
-@date: March 8th, 2018
-"""
-
-import statsmodels.api as sm
-import numpy as np
-
-class OLS_BackwardsSelection(object):
-    def __init__(self, exog, endog):
-        """A custom built backwards selection object based on p-value"""
-        self.modelX = exog.values
-        self.modelY = endog
-        self.variables = list(exog.columns.values)
-        self.modelXBack = None
-        
-        self.model = None
-        self.results = None
-        self.coef = None
-        self.Rsquared = None
-        self.Rsquared_adj = None
-        return None
-    
-    def modelOLS(self, y=None, x=None):
-        """Creates a OLS model instance"""
-        if x == None or y == None:
-            x = self.modelX
-            y = self.modelY
-        self.model = sm.OLS(y,x)
-        self.results = self.model.fit()
-        self.coef = self.results.params
-        self.Rsquared = self.results.rsquared
-        self.Rsquared_adj = self.results.rsquared_adj
-        return None
-    
-    def _removeColumn(self, colNum):
-        """Removes variables based on the index the dataset that is being edited"""
-        del self.variables[colNum]
-        self.modelXBack = np.delete(self.modelXBack, colNum, axis=1)
-        return None
-    
-    def backwardSelect(self, criteria = 0.05, maxSteps = 10):
-        """This backwards selection mechanism uses P-Value to remove the least significant variable"""
-        self.modelXBack = self.modelX.copy() #initialize modelXBack
-        iteration = 0
-        while sum(self.results.pvalues > criteria) != 0 and maxSteps >= iteration and self.Rsquared > 0.7:
-            indexRemove = np.where(self.results.pvalues == max(self.results.pvalues))[0][0] #Get the first index
-            self._removeColumn(colNum=indexRemove)
-            #Remodel with only the selected features
-            self.modelOLS(y=self.modelY, x=self.modelXBack)
-            iteration = iteration + 1
-            
-    def predict(self, exogTest):
-        """Predicts with the current instance of the model"""
-        return self.results.predict(exogTest.loc[:,self.variables])
\ No newline at end of file
+"""
+@title: backwards selection of OLS using P-Value as the selection criteria
+
+@author: Bejan Lee Sadeghian
+@date: March 8th, 2018
+"""
+
+import statsmodels.api as sm
+import numpy as np
+from scipy import linalg, stats
+
+class OLS_BackwardsSelection(object):
+    def __init__(self, exog, endog):
+        """A custom built backwards selection object based on p-value"""
+        self.modelX = exog.values
+        self.modelY = endog
+        self.variables = list(exog.columns.values)
+
+        #Cache one orthogonal decomposition of the full design matrix; the whole
+        #backward path can be read off R and z = Q'y (Leeb-Potscher Lemma A.1)
+        #instead of refitting (X'X)^-1 from scratch after every drop
+        self._Q, self._R = np.linalg.qr(self.modelX)
+        self._z = self._Q.T @ np.asarray(self.modelY, dtype=float)
+        self._w = self._Q.T @ np.ones(self.modelX.shape[0]) #projection of the ones vector, for constant detection
+
+        self.model = None
+        self.results = None
+        self.coef = None
+        self.Rsquared = None
+        self.Rsquared_adj = None
+        return None
+
+    def modelOLS(self, y=None, x=None):
+        """Creates a OLS model instance"""
+        if x is None or y is None:
+            x = self.modelX
+            y = self.modelY
+        self.model = sm.OLS(y,x)
+        self.results = self.model.fit()
+        self.coef = self.results.params
+        self.Rsquared = self.results.rsquared
+        self.Rsquared_adj = self.results.rsquared_adj
+        return None
+
+    def _removeColumn(self, colNum):
+        """Removes variables based on the index the dataset that is being edited"""
+        del self.variables[colNum]
+        self._keep.pop(colNum) #positions in _keep track the surviving variables one-to-one
+        return None
+
+    def _dropVariableQR(self, R, z, w, colNum):
+        """Drops a column from the cached R factor (and z = Q'y, w = Q'1) with Givens
+        rotations, restoring triangularity in O(k^2) instead of redecomposing the design"""
+        R = np.delete(R, colNum, axis=1)
+        k = R.shape[1]
+        for j in range(colNum, k):
+            a, b = R[j, j], R[j+1, j]
+            r = np.hypot(a, b)
+            if r == 0:
+                continue
+            G = np.array([[a/r, b/r], [-b/r, a/r]])
+            R[j:j+2, j:] = G @ R[j:j+2, j:]
+            z[j:j+2] = G @ z[j:j+2]
+            w[j:j+2] = G @ w[j:j+2]
+        #The rotated-out components of z and w fall into the residual space
+        return R[:k, :], z[:k], w[:k]
+
+    def backwardSelect(self, criteria = 0.05, maxSteps = 10):
+        """This backwards selection mechanism uses P-Value to remove the least significant variable"""
+        self._keep = list(range(self.modelX.shape[1])) #initialize surviving-column indices
+        R = self._R.copy()
+        z = self._z.copy()
+        w = self._w.copy()
+        y = np.asarray(self.modelY, dtype=float)
+        yTy = y @ y
+        tssY = np.einsum('i,i->', y - y.mean(), y - y.mean())
+        n = len(y)
+        iteration = 0
+        while maxSteps >= iteration:
+            #Read coefficients, standard errors and R^2 straight off the cached factors
+            k = R.shape[1]
+            rss = yTy - z @ z
+            #statsmodels reports uncentered R^2 unless the design spans a constant
+            #(explicitly or implicitly, e.g. exhaustive dummies); the ones vector lies
+            #in the surviving column space exactly when its residual n - w'w vanishes
+            hasConst = n - w @ w < 1e-8 * n
+            rsquared = 1 - rss / (tssY if hasConst else yTy)
+            #A (near-)zero diagonal entry of R means the design is rank deficient and
+            #the triangular solves below would blow up; fail with the offending column
+            diagR = np.abs(np.diag(R))
+            if np.any(diagR <= diagR.max() * n * np.finfo(float).eps):
+                raise ValueError("Design matrix is rank deficient; column '%s' is collinear "
+                                 "with the others" % self.variables[int(np.argmin(diagR))])
+            Rinv = linalg.solve_triangular(R, np.eye(k))
+            stderr = np.sqrt(rss / (n - k) * np.einsum('ij,ij->i', Rinv, Rinv))
+            coefs = linalg.solve_triangular(R, z)
+            pvalues = 2 * stats.t.sf(np.abs(coefs / stderr), n - k)
+            indexRemove = int(np.argmax(pvalues)) #argmax returns the first index on ties
+            if pvalues[indexRemove] <= criteria or not(rsquared > 0.7):
+                break
+            self._removeColumn(colNum=indexRemove)
+            R, z, w = self._dropVariableQR(R, z, w, indexRemove)
+            iteration = iteration + 1
+        #Fit statsmodels once on the surviving variables for the downstream attributes
+        self.modelOLS(y=self.modelY, x=self.modelX[:, self._keep])
+
+    def predict(self, exogTest):
+        """Predicts with the current instance of the model"""
+        return self.results.predict(exogTest.loc[:,self.variables])
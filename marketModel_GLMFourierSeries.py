@@ -1,5 +1,6 @@
 import numpy as np
 import statsmodels.api as sm
+from scipy.linalg.blas import dgemv
 ###########
 ## Build ##
 ###########
@@ -25,12 +26,14 @@ class marketModel(object):
             7. predictRMSE -> If giving a target array to the predict method then this is the calculated RMSE between predicted and actual {type: float}
         """
         self.coef_ = None
+        self._coef_f = None #contiguous float64 copy of coef_ for the BLAS predict path
         self.chisq = None
         self.pvalues = None
         self.objFunc = None
         self.model = None
         self.constCreated = None
         self.predictRMSE = None
+        self._fourier_cache = {} #memoized sin/cos blocks keyed by (frequencies, trend)
 
     def transform(self, weightData, inputDataArr, by_row = True, add_fourier = False, A = None, trend = None, add_const = True):
         """
@@ -50,6 +53,8 @@ class marketModel(object):
             1. Array for target data (summation)
             2. Matrix of predictors (weighted average)
         """
+        #Normalize to contiguous float64 once so every downstream op stays on the BLAS path
+        weightData = np.ascontiguousarray(weightData, dtype=np.float64)
         n,m = np.shape(weightData)
         self.constCreated = add_const
         #Size check
@@ -58,27 +63,43 @@ class marketModel(object):
 
         #Scaling Matrix Calculation
         if by_row:
-            scaling = weightData / np.multiply(np.sum(weightData, axis=1, keepdims=True), np.ones((1,m)))
+            scaling = weightData / np.sum(weightData, axis=1, keepdims=True)
         else:
-            scaling = weightData / np.multiply(np.ones((n,m)), np.sum(weightData, axis=0, keepdims=True))
-
-        #Transform inputDataArr
-        output = list()
-        for data in inputDataArr:
-             output.append(np.nansum(np.multiply(data,scaling),axis=1))
+            scaling = weightData / np.sum(weightData, axis=0, keepdims=True)
+
+        #Assemble the predictor matrix column-wise to skip the final vstack+transpose copy
+        numFourier = 2 * len(A) if add_fourier else 0
+        predictors = np.empty((n, len(inputDataArr) + numFourier + (1 if add_const else 0)))
+
+        col = len(inputDataArr)
+        if col: #fourier/constant-only designs pass no input matrices to stack
+            #Transform inputDataArr in one batched contraction instead of per-matrix temporaries
+            stack = np.ascontiguousarray(np.stack(inputDataArr, axis=0), dtype=np.float64)
+            nanMask = np.isnan(stack)
+            if nanMask.any(): #clean data (the common case) skips the masking pass entirely
+                stack[nanMask] = 0 #match nansum semantics; stack is our own fresh copy
+            scalingMask = np.isnan(scaling) #NaN weights make whole scaling rows NaN
+            if scalingMask.any():
+                scaling[scalingMask] = 0 #nansum dropped these terms; scaling is our own fresh copy
+            predictors[:, :col] = np.einsum('bnm,nm->nb', stack, scaling)
 
         if add_fourier:
-            for a in A:
-                sin = np.sin(np.multiply(2 * np.pi * a, trend))
-                output.append(sin)
-            for a in A:
-                cos = np.cos(np.multiply(2 * np.pi * a, trend))
-                output.append(cos)
+            #Memoize the trig basis so repeated transforms over the same horizon reuse it
+            trendArr = np.ravel(trend)
+            cacheKey = (tuple(A), trendArr.tobytes())
+            if cacheKey not in self._fourier_cache:
+                #All frequencies at once via the outer product 2*pi*a*trend, one sin/cos call each
+                phases = 2 * np.pi * trendArr[:,None] * np.asarray(A)[None,:]
+                self._fourier_cache[cacheKey] = (np.sin(phases), np.cos(phases))
+            sinBlock, cosBlock = self._fourier_cache[cacheKey]
+            predictors[:, col:col+len(A)] = sinBlock
+            predictors[:, col+len(A):col+numFourier] = cosBlock
+            col = col + numFourier
 
         if self.constCreated:
-            output.append(np.repeat(1,n))
+            predictors[:, col] = 1
 
-        return (np.nansum(weightData,axis=1), np.transpose(np.vstack(output)))
+        return (np.nansum(weightData,axis=1), predictors)
 
     def fitModel(self, target, predictors, objective = sm.robust.norms.TukeyBiweight(c=4.685)):
         """
@@ -105,6 +126,7 @@ class marketModel(object):
         self.objFunc = objective
         self.model = sm.RLM(target, predictors, M=self.objFunc).fit()
         self.coef_ = self.model.params
+        self._coef_f = np.ascontiguousarray(self.coef_, dtype=np.float64) #for the BLAS predict path
         self.pvalues = self.model.pvalues
         self.chisq = self.model.chisq
         return None
@@ -125,8 +147,14 @@ class marketModel(object):
         """
         if self.model is None: #Check if model was fitted
             raise Exception("Model needs to be fitted first.")
+        elif (isinstance(predictors, np.ndarray) and predictors.ndim == 2
+                and predictors.dtype == np.float64 and predictors.flags.c_contiguous):
+            #Skip np.dot's per-call checks; the C-contiguous matrix is an F-ordered
+            #transpose, so trans=1 feeds BLAS without a layout copy
+            prediction = dgemv(1.0, predictors.T, self._coef_f, trans=1)
         else:
             prediction = np.dot(predictors,self.coef_)
         if not(target is None):
-            self.predictRMSE = np.sqrt(np.mean((target - prediction)**2))
+            diff = np.ravel(target - prediction)
+            self.predictRMSE = np.sqrt(np.dot(diff, diff) / diff.size)
         return prediction